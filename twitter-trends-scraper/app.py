@@ -1,19 +1,24 @@
-from flask import Flask, render_template, jsonify
-from utils.scraper import TwitterScraper
-from utils.database import MongoDB
-from datetime import datetime
+from flask import Flask, Response, render_template, jsonify, request
+from utils.scraper import TwitterScraper, ScrapeError
+from utils.database import MongoDB, read_cache
+from utils.events import trend_events, json_default
+from utils.browser import browser_governor
+from utils.logger import configure_logging, correlation_scope
+from utils.models import snapshot_to_dict
+from config.config import TRENDS_CHANGE_STREAM
 import uuid
-from bson import ObjectId  # For handling MongoDB ObjectId
+import psutil
 from flask.json.provider import DefaultJSONProvider
 
 # Custom JSON Provider for Flask to handle ObjectId and datetime
 class CustomJSONProvider(DefaultJSONProvider):
     def default(self, obj):
-        if isinstance(obj, ObjectId):
-            return str(obj)
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+        try:
+            return json_default(obj)
+        except TypeError:
+            return super().default(obj)
+
+configure_logging()
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -23,6 +28,10 @@ app.json = CustomJSONProvider(app)
 scraper = TwitterScraper()
 db = MongoDB()
 
+# Deliver inserts from every worker to this process's stream subscribers
+if TRENDS_CHANGE_STREAM:
+    trend_events.watch(db.collection)
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -30,29 +39,89 @@ def index():
 @app.route('/scrape')
 def scrape_trends():
     unique_id = str(uuid.uuid4())
-    trends = scraper.get_trends()
+    with correlation_scope(unique_id):
+        return _scrape_trends(unique_id)
+
+def _scrape_trends(unique_id):
+    try:
+        snapshot = scraper.get_trends(unique_id=unique_id)
+    except ScrapeError as e:
+        return jsonify({'status': 'error', 'cause': e.cause, 'message': str(e)}), 502
+    except Exception as e:
+        app.logger.exception("Unexpected scrape failure")
+        return jsonify({'status': 'error', 'cause': 'internal', 'message': str(e)}), 500
 
-    if trends:
+    if snapshot:
+        # get_trends has already stored the snapshot
         data = {
-            'unique_id': unique_id,
-            'trend1': trends[0] if len(trends) > 0 else None,
-            'trend2': trends[1] if len(trends) > 1 else None,
-            'trend3': trends[2] if len(trends) > 2 else None,
-            'trend4': trends[3] if len(trends) > 3 else None,
-            'trend5': trends[4] if len(trends) > 4 else None,
-            'timestamp': datetime.now(),
-            'ip_address': scraper.current_ip
+            'unique_id': snapshot['unique_id'],
+            'trends': [trend.to_dict() for trend in snapshot['trends']],
+            'timestamp': snapshot['timestamp'],
+            'ip_address': snapshot['ip_address'],
+            'inserted_id': str(snapshot['_id'])
         }
 
-        # Insert data into MongoDB
-        inserted_id = db.insert_trends(data)
+        return jsonify({'status': 'success', 'data': data})
 
-        # Add the inserted ID to the response data
-        data['inserted_id'] = str(inserted_id)
+    return jsonify({'status': 'error', 'cause': 'no_trends', 'message': 'Failed to scrape trends'}), 502
 
-        return jsonify({'status': 'success', 'data': data})
+@app.route('/trends/stream')
+def stream_trends():
+    # Server-Sent Events: one long-lived response per viewer, no scraping
+    return Response(
+        trend_events.stream(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@app.route('/trends/latest')
+def latest_trends():
+    limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+    documents = db.get_latest_trends(limit=limit)
+    return jsonify({'status': 'success', 'data': [snapshot_to_dict(document) for document in documents]})
+
+@app.route('/trends/history/<name>')
+def trend_history(name):
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    documents = db.get_trend_history(name, limit=limit)
+    return jsonify({'status': 'success', 'data': [snapshot_to_dict(document) for document in documents]})
+
+@app.route('/trends/<unique_id>')
+def trends_by_id(unique_id):
+    document = db.get_trends_by_id(unique_id)
+    if document is None:
+        return jsonify({'status': 'error', 'message': 'Trends not found'}), 404
+    return jsonify({'status': 'success', 'data': snapshot_to_dict(document)})
+
+@app.route('/stats')
+def stats():
+    process = psutil.Process()
+    rotator = scraper.proxy_rotator
+    return jsonify({
+        'process': {
+            'pid': process.pid,
+            'rss_mb': round(process.memory_info().rss / (1024 * 1024), 1),
+            'threads': process.num_threads()
+        },
+        'browsers': browser_governor.stats(),
+        'read_cache': read_cache.stats(),
+        'proxies': {
+            'enabled': rotator is not None,
+            'working_proxies': len(rotator.working_proxies) if rotator else 0
+        },
+        'stream_subscribers': trend_events.subscriber_count
+    })
+
+@app.route('/stats/db')
+def db_stats():
+    return jsonify({'read_cache': read_cache.stats()})
 
-    return jsonify({'status': 'error', 'message': 'Failed to scrape trends'})
+@app.route('/stats/browsers')
+def browser_stats():
+    return jsonify(browser_governor.stats())
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    app.run(debug=True, threaded=True)
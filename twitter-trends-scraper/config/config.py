@@ -8,10 +8,40 @@ load_dotenv()
 # Twitter credentials
 TWITTER_USERNAME = os.getenv('TWITTER_USERNAME')
 TWITTER_PASSWORD = os.getenv('TWITTER_PASSWORD')
+# Point at a local fixture site for load testing, e.g. http://127.0.0.1:8001
+TWITTER_BASE_URL = os.getenv('TWITTER_BASE_URL', 'https://twitter.com').rstrip('/')
+USE_PROXIES = os.getenv('USE_PROXIES', 'True').lower() == 'true'
 
 # MongoDB settings
 MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
 DB_NAME = os.getenv('DB_NAME', 'twitter_trends')
+MONGODB_MAX_POOL_SIZE = int(os.getenv('MONGODB_MAX_POOL_SIZE', '20'))
+MONGODB_MIN_POOL_SIZE = int(os.getenv('MONGODB_MIN_POOL_SIZE', '0'))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGODB_SERVER_SELECTION_TIMEOUT_MS', '3000'))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv('MONGODB_CONNECT_TIMEOUT_MS', '3000'))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv('MONGODB_SOCKET_TIMEOUT_MS', '10000'))
+# Comma separated: zlib needs no extra package, snappy/zstd need python-snappy/zstandard
+MONGODB_COMPRESSORS = os.getenv('MONGODB_COMPRESSORS', 'zlib')
+MONGODB_RETRY_WRITES = os.getenv('MONGODB_RETRY_WRITES', 'True').lower() == 'true'
+
+# Read cache for latest/by-id lookups
+DB_CACHE_SIZE = int(os.getenv('DB_CACHE_SIZE', '256'))
+DB_CACHE_TTL = float(os.getenv('DB_CACHE_TTL', '30'))
+
+# Live trend stream settings
+SSE_KEEPALIVE_SECONDS = float(os.getenv('SSE_KEEPALIVE_SECONDS', '15'))
+TRENDS_CHANGE_STREAM = os.getenv('TRENDS_CHANGE_STREAM', 'False').lower() == 'true'
+
+# Browser resource governor settings
+BROWSER_RSS_LIMIT_MB = int(os.getenv('BROWSER_RSS_LIMIT_MB', '1024'))
+BROWSER_TOTAL_RSS_LIMIT_MB = int(os.getenv('BROWSER_TOTAL_RSS_LIMIT_MB', '2048'))
+BROWSER_GOVERNOR_INTERVAL = float(os.getenv('BROWSER_GOVERNOR_INTERVAL', '30'))
+
+# Logging settings
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+# Per-subsystem overrides, e.g. 'FreeProxyRotator=WARNING,TwitterScraper=DEBUG'
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
 
 # Application settings
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
\ No newline at end of file
@@ -0,0 +1,6 @@
+# loadtest/__init__.py
+
+"""
+Load and soak testing tools: a local fixture site standing in for X/Twitter
+and a driver that sweeps concurrency levels and writes comparable reports.
+"""
@@ -0,0 +1,109 @@
+# loadtest/fixture_site.py
+
+"""
+Local stand-in for the X/Twitter pages TwitterScraper drives: a login flow
+with the same selectors and a home page with a 'What's happening' panel.
+Point the app at it with TWITTER_BASE_URL=http://127.0.0.1:<port>.
+
+Usage:
+    python -m loadtest.fixture_site --port 8001
+"""
+
+import argparse
+import itertools
+import random
+import threading
+
+from flask import Flask
+
+CATEGORIES = ['Trending in India', 'Sports · Trending', 'Politics · Trending',
+              'Entertainment · Trending', 'Technology · Trending']
+NAMES = ['#LoadTest', 'Soak Run', '#Fixture', 'Local Mongo', 'Chrome Pool',
+         '#Latency', 'Proxy Health', 'Flask', '#P99', 'Throughput']
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<body>
+    <div id="step-username">
+        <input autocomplete="username">
+        <div role="button" onclick="showPassword()"><span>Next</span></div>
+    </div>
+    <div id="step-password" style="display:none">
+        <input name="password" type="password">
+        <div role="button" onclick="window.location.href='/home'"><span>Log in</span></div>
+    </div>
+    <script>
+        function showPassword() {
+            document.getElementById('step-username').style.display = 'none';
+            document.getElementById('step-password').style.display = 'block';
+        }
+    </script>
+</body>
+</html>"""
+
+# The scraper takes the outermost div above 'Search', then the first div
+# following an ancestor of "What's happening", so the panel must be the
+# sibling of the label's wrapper and the root div must have no siblings.
+HOME_PAGE = """<!DOCTYPE html>
+<html>
+<body>
+    <div id="root">
+        <a data-testid="AppTabBar_Profile_Link" aria-label="Profile" href="/home">Profile</a>
+        <span>Search</span>
+        <div><span>What's happening</span></div>
+        <div>{trends}</div>
+    </div>
+</body>
+</html>"""
+
+TREND_CELL = """
+            <div data-testid="trend">
+                <div dir="auto">{category}</div>
+                <div dir="auto">{name}</div>
+                <div dir="auto">{posts} posts</div>
+            </div>"""
+
+
+def create_app() -> Flask:
+    app = Flask(__name__)
+    counter = itertools.count()
+    lock = threading.Lock()
+
+    @app.route('/i/flow/login')
+    def login():
+        return LOGIN_PAGE
+
+    @app.route('/home')
+    def home():
+        with lock:
+            offset = next(counter)
+        cells = []
+        for i in range(5):
+            name = NAMES[(offset + i) % len(NAMES)]
+            count = random.randint(1, 9999)
+            posts = f"{count / 10:.1f}K" if count > 999 else f"{count:,}"
+            cells.append(TREND_CELL.format(
+                category=CATEGORIES[(offset + i) % len(CATEGORIES)],
+                name=name,
+                posts=posts
+            ))
+        return HOME_PAGE.format(trends=''.join(cells))
+
+    return app
+
+
+def serve_in_background(host: str = '127.0.0.1', port: int = 8001):
+    """Start the fixture site on a daemon thread; returns the server"""
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, name='FixtureSite', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve the local X/Twitter fixture site')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    args = parser.parse_args()
+    create_app().run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,395 @@
+# loadtest/run.py
+
+"""
+Load and soak test driver for the Flask app.
+
+Drives /scrape and the read endpoints (/trends/latest, /trends/<unique_id>)
+at each concurrency level for a fixed duration, samples /stats and the
+local Chrome process count over time, and writes a JSON report.
+
+Typical setup, all local:
+    mongod --dbpath /tmp/mongo
+    python -m loadtest.fixture_site --port 8001
+    TWITTER_BASE_URL=http://127.0.0.1:8001 USE_PROXIES=false python app.py
+
+Usage:
+    python -m loadtest.run --concurrency 1,10,50 --duration 5m --report reports/v1.json
+    python -m loadtest.run --concurrency 10 --duration 24h --report reports/soak.json
+    python -m loadtest.run --compare reports/v1.json reports/v2.json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import psutil
+import requests
+
+from utils.browser import BROWSER_PROCESS_NAMES
+
+MB = 1024 * 1024
+
+# Latency histogram: ~2% wide log buckets keep memory constant on 24 h runs
+_BUCKET_BASE = 1.02
+_LOG_BASE = math.log(_BUCKET_BASE)
+
+
+class LatencyHistogram:
+    """Constant-memory latency recorder with percentile estimates"""
+
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms: float):
+        self.buckets[math.floor(math.log(max(ms, 0.01)) / _LOG_BASE)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def merge(self, other: 'LatencyHistogram'):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.count:
+            return None
+        target = math.ceil(self.count * p / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                # Upper edge of the bucket, never above the observed max
+                return round(min(_BUCKET_BASE ** (bucket + 1), self.max), 2)
+        return round(self.max, 2)
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 2) if self.count else None,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': round(self.max, 2) if self.count else None
+        }
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors: Counter = Counter()
+
+    def summary(self, elapsed: float) -> Dict:
+        requests_made = self.latency.count
+        errors = sum(self.errors.values())
+        return {
+            **self.latency.summary(),
+            'throughput_rps': round(requests_made / elapsed, 2) if elapsed else 0.0,
+            'errors': errors,
+            'error_rate': round(errors / requests_made, 4) if requests_made else 0.0,
+            'errors_by_cause': dict(self.errors)
+        }
+
+
+class LoadRunner:
+    """Runs one concurrency level at a time against the target app"""
+
+    def __init__(self, target: str, scrape_weight: float, timeout: float):
+        self.target = target.rstrip('/')
+        self.scrape_weight = scrape_weight
+        self.timeout = timeout
+        self.known_ids = deque(maxlen=100)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, EndpointStats] = {}
+        self._recent = deque(maxlen=1000)
+
+    def _pick_endpoint(self) -> tuple:
+        if random.random() < self.scrape_weight:
+            return 'scrape', '/scrape'
+        with self._lock:
+            unique_id = random.choice(self.known_ids) if self.known_ids else None
+        if unique_id and random.random() < 0.5:
+            return 'trends_by_id', f'/trends/{unique_id}'
+        return 'trends_latest', '/trends/latest?limit=10'
+
+    @staticmethod
+    def _classify(response: requests.Response) -> Optional[str]:
+        try:
+            body = response.json()
+        except ValueError:
+            return f'http_{response.status_code}' if response.status_code >= 400 else 'invalid_json'
+        if body.get('status') != 'success':
+            # /scrape reports driver/login/no_trends/db/internal failures
+            return body.get('cause') or f'http_{response.status_code}'
+        if response.status_code >= 400:
+            return f'http_{response.status_code}'
+        return None
+
+    def _remember_ids(self, name: str, response: requests.Response):
+        try:
+            data = response.json().get('data')
+        except ValueError:
+            return
+        documents = data if isinstance(data, list) else [data]
+        with self._lock:
+            for document in documents:
+                if isinstance(document, dict) and document.get('unique_id'):
+                    self.known_ids.append(document['unique_id'])
+
+    def _request(self, session: requests.Session):
+        name, path = self._pick_endpoint()
+        cause = None
+        started = time.perf_counter()
+        try:
+            response = session.get(self.target + path, timeout=self.timeout)
+            cause = self._classify(response)
+            if cause is None and name != 'trends_by_id':
+                self._remember_ids(name, response)
+        except requests.Timeout:
+            cause = 'timeout'
+        except requests.ConnectionError:
+            cause = 'connection'
+        except Exception as e:
+            cause = type(e).__name__
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            stats = self._stats.setdefault(name, EndpointStats())
+            stats.latency.record(elapsed_ms)
+            if cause:
+                stats.errors[cause] += 1
+            self._recent.append(cause is not None)
+
+    def _worker(self, deadline: float):
+        with requests.Session() as session:
+            while time.monotonic() < deadline:
+                self._request(session)
+
+    def recent_error_rate(self) -> float:
+        with self._lock:
+            return round(sum(self._recent) / len(self._recent), 4) if self._recent else 0.0
+
+    def run_level(self, concurrency: int, duration: float) -> Dict:
+        with self._lock:
+            self._stats = {}
+            self._recent.clear()
+
+        started = time.monotonic()
+        deadline = started + duration
+        workers = [
+            threading.Thread(target=self._worker, args=(deadline,), name=f'LoadWorker-{i}', daemon=True)
+            for i in range(concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - started
+
+        with self._lock:
+            endpoints = {name: stats.summary(elapsed) for name, stats in self._stats.items()}
+            overall = EndpointStats()
+            for stats in self._stats.values():
+                overall.latency.merge(stats.latency)
+                overall.errors.update(stats.errors)
+
+        return {
+            'concurrency': concurrency,
+            'duration_s': round(elapsed, 1),
+            'overall': overall.summary(elapsed),
+            'endpoints': endpoints
+        }
+
+
+def local_browser_usage() -> Dict:
+    """Count every chrome/chromedriver process on this host, tracked or not"""
+    count = 0
+    rss = 0
+    for proc in psutil.process_iter(['name', 'memory_info']):
+        name = (proc.info['name'] or '').lower()
+        if name.startswith(BROWSER_PROCESS_NAMES):
+            count += 1
+            if proc.info['memory_info']:
+                rss += proc.info['memory_info'].rss
+    return {'processes': count, 'rss_mb': round(rss / MB, 1)}
+
+
+class Sampler:
+    """Polls /stats and local process counts on a background thread"""
+
+    def __init__(self, target: str, runner: LoadRunner, interval: float):
+        self.target = target.rstrip('/')
+        self.runner = runner
+        self.interval = interval
+        self.level: Optional[int] = None
+        self.samples: List[Dict] = []
+        self._stop = threading.Event()
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='Sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            self.samples.append(self.sample())
+            if self._stop.wait(self.interval):
+                break
+
+    def sample(self) -> Dict:
+        row = {
+            'elapsed_s': round(time.monotonic() - self._started, 1),
+            'concurrency': self.level,
+            'error_rate': self.runner.recent_error_rate(),
+            'local_browsers': local_browser_usage()
+        }
+        try:
+            stats = requests.get(f'{self.target}/stats', timeout=5).json()
+            row.update({
+                'app_rss_mb': stats['process']['rss_mb'],
+                'app_threads': stats['process']['threads'],
+                'drivers': stats['browsers']['drivers'],
+                'browser_rss_mb': stats['browsers']['rss_mb'],
+                'browsers_recycled': stats['browsers']['recycled'],
+                'browsers_reaped': stats['browsers']['reaped'],
+                'working_proxies': stats['proxies']['working_proxies'],
+                'cache_hit_rate': stats['read_cache']['hit_rate']
+            })
+        except Exception as e:
+            row['stats_error'] = type(e).__name__
+        return row
+
+
+def parse_duration(text: str) -> float:
+    """'90', '90s', '10m', '24h' -> seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    text = text.strip().lower()
+    if text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def git_version() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare_reports(old_path: str, new_path: str):
+    """Print per-level latency and error deltas between two reports"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    old_levels = {level['concurrency']: level for level in old['levels']}
+    print(f"{old['meta'].get('label') or old_path} -> {new['meta'].get('label') or new_path}")
+    print(f"{'conc':>5} {'endpoint':<14} {'metric':<12} {'old':>10} {'new':>10} {'delta':>9}")
+
+    for level in new['levels']:
+        previous = old_levels.get(level['concurrency'])
+        if previous is None:
+            continue
+        for endpoint in ['overall'] + sorted(level['endpoints']):
+            current = level['overall'] if endpoint == 'overall' else level['endpoints'][endpoint]
+            before = previous['overall'] if endpoint == 'overall' else previous['endpoints'].get(endpoint)
+            if not before:
+                continue
+            for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'error_rate', 'throughput_rps'):
+                a, b = before.get(metric), current.get(metric)
+                delta = f"{(b - a) / a * 100:+.1f}%" if a and b is not None else '-'
+                print(f"{level['concurrency']:>5} {endpoint:<14} {metric:<12} {str(a):>10} {str(b):>10} {delta:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load/soak test the trends scraper app')
+    parser.add_argument('--target', default='http://127.0.0.1:5000', help='Base URL of the running app')
+    parser.add_argument('--concurrency', default='1,5,10,50', help='Comma separated concurrency sweep')
+    parser.add_argument('--duration', default='60s', help='Duration per level, e.g. 90s, 10m, 24h')
+    parser.add_argument('--scrape-weight', type=float, default=0.1, help='Fraction of requests sent to /scrape')
+    parser.add_argument('--timeout', type=float, default=300, help='Per-request timeout in seconds')
+    parser.add_argument('--sample-interval', default='10s', help='How often to sample /stats and processes')
+    parser.add_argument('--fixture-port', type=int, help='Also serve the fixture site on this port')
+    parser.add_argument('--label', help='Name for this run in comparisons (defaults to git describe)')
+    parser.add_argument('--report', default='loadtest-report.json', help='Where to write the JSON report')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two reports and exit')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare_reports(*args.compare)
+        return 0
+
+    if args.fixture_port:
+        from loadtest.fixture_site import serve_in_background
+        serve_in_background(port=args.fixture_port)
+
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    duration = parse_duration(args.duration)
+
+    runner = LoadRunner(args.target, args.scrape_weight, args.timeout)
+    sampler = Sampler(args.target, runner, parse_duration(args.sample_interval))
+    started = datetime.now(timezone.utc)
+    sampler.start()
+
+    results = []
+    try:
+        for concurrency in levels:
+            sampler.level = concurrency
+            print(f"Running {concurrency} concurrent clients for {args.duration}...", flush=True)
+            result = runner.run_level(concurrency, duration)
+            overall = result['overall']
+            print(f"  p50={overall['p50_ms']}ms p95={overall['p95_ms']}ms p99={overall['p99_ms']}ms "
+                  f"rps={overall['throughput_rps']} errors={overall['error_rate']:.2%}", flush=True)
+            results.append(result)
+    finally:
+        sampler.stop()
+
+    version = git_version()
+    report = {
+        'meta': {
+            'label': args.label or version,
+            'version': version,
+            'started': started.isoformat(),
+            'finished': datetime.now(timezone.utc).isoformat(),
+            'target': args.target,
+            'concurrency': levels,
+            'duration_s': duration,
+            'scrape_weight': args.scrape_weight,
+            'host': {'cpus': os.cpu_count(), 'memory_mb': round(psutil.virtual_memory().total / MB)}
+        },
+        'levels': results,
+        'samples': sampler.samples
+    }
+
+    directory = os.path.dirname(args.report)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.report}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# tests/test_browser.py
+
+import time
+
+import pytest
+
+from utils import browser
+from utils.browser import MB, BrowserGovernor, _TrackedDriver
+
+ME = 4242
+USER = 'scraper'
+OLD = time.time() - 3600
+
+
+class FakeProcess:
+    """psutil.Process stand-in that records kills instead of sending signals"""
+
+    def __init__(self, pid, name='chrome', ppid=ME, username=USER, create_time=OLD,
+                 cmdline=('--remote-debugging-port=0',), rss=0, children=()):
+        self.pid = pid
+        self.info = {'pid': pid, 'ppid': ppid, 'name': name,
+                     'username': username, 'create_time': create_time}
+        self._cmdline = list(cmdline)
+        self._rss = rss
+        self._children = list(children)
+        self.killed = False
+
+    def cmdline(self):
+        return self._cmdline
+
+    def children(self, recursive=False):
+        return self._children
+
+    def is_running(self):
+        return not self.killed
+
+    def memory_info(self):
+        return type('mem', (), {'rss': self._rss})()
+
+    def username(self):
+        return USER
+
+    def kill(self):
+        self.killed = True
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def procs(monkeypatch):
+    """Process table seen by the governor; tests append FakeProcess entries"""
+    table = []
+    monkeypatch.setattr(browser.os, 'getpid', lambda: ME)
+    monkeypatch.setattr(browser.psutil, 'Process', lambda pid: FakeProcess(pid))
+    monkeypatch.setattr(browser.psutil, 'process_iter', lambda attrs: list(table))
+    monkeypatch.setattr(browser.psutil, 'pid_exists', lambda pid: any(p.pid == pid for p in table))
+    monkeypatch.setattr(browser.psutil, 'wait_procs', lambda processes, timeout=None: ([], []))
+    return table
+
+
+def track(governor, rss, started, pid):
+    root = FakeProcess(pid, name='chromedriver', rss=rss * MB)
+    driver = FakeDriver()
+    entry = _TrackedDriver(driver, root)
+    entry.started = started
+    governor._drivers[id(driver)] = entry
+    return driver, root
+
+
+def test_reaps_leaked_chromedriver_and_automation_chrome(procs):
+    driver = FakeProcess(100, name='chromedriver', cmdline=())
+    chrome = FakeProcess(101, ppid=1)
+    procs.extend([driver, chrome])
+
+    assert BrowserGovernor().reap_orphans() == 2
+    assert driver.killed and chrome.killed
+
+
+def test_never_reaps_tracked_processes(procs):
+    governor = BrowserGovernor()
+    _, root = track(governor, rss=100, started=OLD, pid=100)
+    procs.append(root)
+
+    assert governor.reap_orphans() == 0
+    assert not root.killed
+
+
+def test_never_reaps_processes_inside_grace_period(procs):
+    starting = [
+        FakeProcess(100, name='chromedriver', cmdline=(), create_time=time.time()),
+        FakeProcess(101, ppid=1, create_time=time.time())
+    ]
+    procs.extend(starting)
+
+    assert BrowserGovernor().reap_orphans() == 0
+    assert not any(proc.killed for proc in starting)
+
+
+def test_never_reaps_user_browsers(procs):
+    user_browsers = [
+        # Orphaned but not started by chromedriver
+        FakeProcess(100, ppid=1, cmdline=('--profile-directory=Default',)),
+        # Our own child without the automation flag
+        FakeProcess(101, cmdline=()),
+        # Automation Chrome with a live parent that is not us
+        FakeProcess(102, ppid=200),
+        FakeProcess(200, name='bash', ppid=1),
+        # Another user's orphaned automation Chrome
+        FakeProcess(103, ppid=1, username='someone-else')
+    ]
+    procs.extend(user_browsers)
+
+    assert BrowserGovernor().reap_orphans() == 0
+    assert not any(proc.killed for proc in user_browsers)
+
+
+def test_sweep_recycles_driver_over_its_cap(procs):
+    governor = BrowserGovernor(driver_limit_mb=500, total_limit_mb=10_000)
+    big, big_root = track(governor, rss=600, started=OLD, pid=100)
+    small, small_root = track(governor, rss=100, started=OLD, pid=101)
+
+    governor.sweep()
+
+    assert big.quit_called and big_root.killed
+    assert not small.quit_called and not small_root.killed
+    assert governor.recycled == 1
+
+
+def test_sweep_global_cap_recycles_oldest_first(procs):
+    governor = BrowserGovernor(driver_limit_mb=1000, total_limit_mb=1000)
+    now = time.time()
+    newest, _ = track(governor, rss=400, started=now, pid=100)
+    oldest, _ = track(governor, rss=400, started=now - 300, pid=101)
+    middle, _ = track(governor, rss=400, started=now - 100, pid=102)
+
+    governor.sweep()
+
+    # 1200 MB over a 1000 MB cap: dropping the oldest driver is enough
+    assert oldest.quit_called
+    assert not middle.quit_called and not newest.quit_called
+    assert governor.stats()['drivers'] == 2
@@ -0,0 +1,111 @@
+# tests/test_cache.py
+
+from utils import cache
+from utils.cache import ReadCache
+
+
+class Clock:
+    """Stand-in for time.monotonic that tests advance by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def loader_returning(value, calls):
+    def load():
+        calls.append(value)
+        return value
+    return load
+
+
+def test_hit_after_miss():
+    read_cache = ReadCache()
+    calls = []
+
+    assert read_cache.get_or_load('k', loader_returning(1, calls)) == 1
+    assert read_cache.get_or_load('k', loader_returning(2, calls)) == 1
+    assert calls == [1]
+
+
+def test_invalidate_during_load_skips_store():
+    read_cache = ReadCache()
+
+    def racing_loader():
+        # A write lands while the read is in flight
+        read_cache.invalidate()
+        return 'stale'
+
+    assert read_cache.get_or_load('k', racing_loader) == 'stale'
+    assert read_cache.stats()['entries'] == 0
+
+    calls = []
+    assert read_cache.get_or_load('k', loader_returning('fresh', calls)) == 'fresh'
+    assert calls == ['fresh']
+
+
+def test_cache_none_false_does_not_store_misses():
+    read_cache = ReadCache()
+    calls = []
+
+    assert read_cache.get_or_load('k', loader_returning(None, calls), cache_none=False) is None
+    assert read_cache.get_or_load('k', loader_returning(None, calls), cache_none=False) is None
+    assert len(calls) == 2
+
+    read_cache.get_or_load('other', loader_returning(None, calls))
+    read_cache.get_or_load('other', loader_returning(None, calls))
+    assert len(calls) == 3
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, 'monotonic', clock)
+    read_cache = ReadCache(ttl=30)
+    calls = []
+
+    read_cache.get_or_load('k', loader_returning(1, calls))
+    clock.now += 29
+    assert read_cache.get_or_load('k', loader_returning(2, calls)) == 1
+    clock.now += 2
+    assert read_cache.get_or_load('k', loader_returning(2, calls)) == 2
+    assert calls == [1, 2]
+
+
+def test_zero_ttl_disables_caching():
+    read_cache = ReadCache(ttl=0)
+    calls = []
+
+    read_cache.get_or_load('k', loader_returning(1, calls))
+    read_cache.get_or_load('k', loader_returning(1, calls))
+    assert len(calls) == 2
+    assert read_cache.stats()['entries'] == 0
+
+
+def test_evicts_least_recently_used():
+    read_cache = ReadCache(max_entries=2)
+    calls = []
+
+    read_cache.get_or_load('a', loader_returning('a', calls))
+    read_cache.get_or_load('b', loader_returning('b', calls))
+    read_cache.get_or_load('a', loader_returning('a', calls))  # 'b' is now least recent
+    read_cache.get_or_load('c', loader_returning('c', calls))
+
+    assert read_cache.stats()['entries'] == 2
+    read_cache.get_or_load('a', loader_returning('a', calls))
+    read_cache.get_or_load('b', loader_returning('b', calls))
+    assert calls == ['a', 'b', 'c', 'b']
+
+
+def test_stats_hit_rate():
+    read_cache = ReadCache()
+    assert read_cache.stats()['hit_rate'] == 0.0
+
+    for _ in range(3):
+        read_cache.get_or_load('k', lambda: 1)
+    read_cache.invalidate()
+
+    stats = read_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (2, 1, 1)
+    assert stats['hit_rate'] == 0.6667
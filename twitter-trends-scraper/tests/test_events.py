@@ -0,0 +1,96 @@
+# tests/test_events.py
+
+import json
+from datetime import datetime
+
+from bson import ObjectId
+
+from utils.events import TrendEventBus
+
+
+def snapshot(n):
+    return {'unique_id': f'id-{n}', 'trends': [{'rank': 1, 'name': f'#Trend{n}'}]}
+
+
+def payload(frame):
+    data = next(line for line in frame.splitlines() if line.startswith('data: '))
+    return json.loads(data[len('data: '):])
+
+
+def drain(q):
+    frames = []
+    while not q.empty():
+        frames.append(q.get_nowait())
+    return frames
+
+
+def test_publish_fans_out_to_every_subscriber():
+    bus = TrendEventBus()
+    first, second = bus.subscribe(), bus.subscribe()
+
+    bus.publish(snapshot(1))
+
+    for q in (first, second):
+        (frame,) = drain(q)
+        assert frame.startswith('id: id-1\nevent: trends\n')
+        assert payload(frame)['unique_id'] == 'id-1'
+
+
+def test_slow_subscriber_drops_oldest_and_keeps_newest():
+    bus = TrendEventBus(max_queue=3)
+    q = bus.subscribe()
+
+    for n in range(5):
+        bus.publish(snapshot(n))
+
+    assert [payload(frame)['unique_id'] for frame in drain(q)] == ['id-2', 'id-3', 'id-4']
+
+
+def test_new_subscriber_is_primed_with_last_event():
+    bus = TrendEventBus()
+    assert drain(bus.subscribe()) == []
+
+    bus.publish(snapshot(1))
+    bus.publish(snapshot(2))
+
+    assert [payload(frame)['unique_id'] for frame in drain(bus.subscribe())] == ['id-2']
+
+
+def test_notify_inserted_is_skipped_while_watching():
+    bus = TrendEventBus()
+    q = bus.subscribe()
+
+    bus._stream_open.set()
+    bus.notify_inserted(snapshot(1))
+    assert drain(q) == []
+
+    bus._stream_open.clear()
+    bus.notify_inserted(snapshot(2))
+    assert [payload(frame)['unique_id'] for frame in drain(q)] == ['id-2']
+
+
+def test_stream_yields_retry_events_and_keepalive_then_unsubscribes():
+    bus = TrendEventBus(keepalive=0.01)
+    bus.publish(snapshot(1))
+    frames = bus.stream()
+
+    assert next(frames) == 'retry: 3000\n\n'
+    assert bus.subscriber_count == 1
+    assert payload(next(frames))['unique_id'] == 'id-1'
+    assert next(frames) == ': keepalive\n\n'
+
+    frames.close()
+    assert bus.subscriber_count == 0
+
+
+def test_publish_encodes_object_ids_and_datetimes():
+    bus = TrendEventBus()
+    q = bus.subscribe()
+    object_id = ObjectId()
+    created = datetime(2025, 1, 2, 3, 4, 5)
+
+    bus.publish({'_id': object_id, 'unique_id': 'id-1', 'created_at': created})
+
+    data = payload(drain(q)[0])
+    assert data['_id'] == str(object_id)
+    assert data['created_at'] == '2025-01-02T03:04:05'
@@ -0,0 +1,14 @@
+# tests/test_loadtest.py
+
+import pytest
+
+from loadtest.run import _BUCKET_BASE, LatencyHistogram
+
+
+@pytest.mark.parametrize('ms', [0.05, 0.3, 0.99, 1.5, 42.0, 2500.0])
+def test_sample_lands_in_the_bucket_whose_edges_contain_it(ms):
+    histogram = LatencyHistogram()
+    histogram.record(ms)
+
+    (bucket,) = histogram.buckets
+    assert _BUCKET_BASE ** bucket <= ms < _BUCKET_BASE ** (bucket + 1)
@@ -0,0 +1,53 @@
+# tests/test_models.py
+
+import pytest
+
+from utils.models import Trend, parse_trends, parse_trends_bulk
+
+# One snapshot per case: context lines, '·' categories, K/M/B/comma counts,
+# '#' names, bare names, multi-line cells and empty documents
+DOCUMENTS = [
+    ['Trending in India', '#IPL2025', '12.3K posts',
+     'Sports · Trending', 'Virat Kohli', '1,234 posts',
+     'Politics · Trending', 'Election', '2M posts',
+     'Entertainment · Trending', '#Oscars', '1.5B posts',
+     'Bare Name', 'Another Bare Name'],
+    ['Trending in India\n#IPL2025\n12.3K posts', 'Music · Trending\nTaylor Swift\n3.4M Tweets'],
+    ['#OnlyName'],
+    ['  ＦＯＯ   Bar  ', '999 posts', 'Only on X · Trending', '#foo bar', '10k posts'],
+    ['Trending', 'Promoted by Brand', 'Sale', '7 posts'],
+    [],
+    ['', '\n'],
+]
+
+
+def test_bulk_matches_scalar_parser():
+    pytest.importorskip('pandas')
+    bulk = parse_trends_bulk(DOCUMENTS)
+
+    assert len(bulk) == len(DOCUMENTS)
+    for fragments, trends in zip(DOCUMENTS, bulk):
+        assert trends == parse_trends(fragments)
+
+
+def test_bulk_matches_scalar_parser_without_limit():
+    pytest.importorskip('pandas')
+    bulk = parse_trends_bulk(DOCUMENTS, limit=None)
+
+    for fragments, trends in zip(DOCUMENTS, bulk):
+        assert trends == parse_trends(fragments, limit=None)
+
+
+def test_parsed_fields():
+    trends = parse_trends(DOCUMENTS[0], limit=None)
+
+    assert [trend.post_count for trend in trends] == [12_300, 1_234, 2_000_000, 1_500_000_000, None, None]
+    assert [trend.category for trend in trends] == ['Trending in India', 'Sports', 'Politics', 'Entertainment', None, None]
+    assert trends[0] == Trend(1, '#IPL2025', 'ipl2025', 'Trending in India', 12_300)
+    assert Trend.normalize_name('  ＦＯＯ   Bar  ') == 'foo bar'
+
+
+def test_empty_documents():
+    pytest.importorskip('pandas')
+    assert parse_trends_bulk([[], []]) == [[], []]
+    assert parse_trends([]) == []
@@ -9,13 +9,27 @@ Components:
 - FreeProxyRotator: Handles IP rotation using free proxy services
 - TwitterScraper: Manages the web scraping process
 - MongoDB: Handles database operations
+- TrendEventBus: Pushes newly stored trends to live subscribers
+- BrowserGovernor: Caps Chrome memory and reaps orphaned browser processes
+- configure_logging: Central queue-based JSON logging with correlation IDs
+- Trend: Typed trend model with parsed post counts and normalized names
 """
 
 from .proxy import FreeProxyRotator
 from .scraper import TwitterScraper
 from .database import MongoDB
-
-__all__ = ['FreeProxyRotator', 'TwitterScraper', 'MongoDB']
+from .events import TrendEventBus, trend_events
+from .browser import BrowserGovernor, browser_governor
+from .logger import configure_logging, correlation_scope
+from .models import Trend, parse_trends, parse_trends_bulk
+
+__all__ = [
+    'FreeProxyRotator', 'TwitterScraper', 'MongoDB',
+    'TrendEventBus', 'trend_events',
+    'BrowserGovernor', 'browser_governor',
+    'configure_logging', 'correlation_scope',
+    'Trend', 'parse_trends', 'parse_trends_bulk'
+]
 
 # Version of the utils package
 __version__ = '1.0.1'
@@ -50,22 +64,39 @@ Complete Process Flow:
    d. Scraping process:
       - Wait for trends section to load
       - Extract top 5 trending topics
+      - Parse them into Trend objects (models.py): rank, name,
+        normalized name, category and integer post count
       - Close browser session
+   e. BrowserGovernor (browser.py) tracks each Chrome process tree:
+      - Recycles drivers over the per-driver or global RSS cap
+      - Reaps orphaned chrome/chromedriver processes periodically
 
 5. Database Operations (database.py):
-   a. MongoDB connection established
+   a. MongoDB connection established (one pooled MongoClient per
+      process from get_client(), shared by every MongoDB instance)
    b. New document created with:
       - Unique ID (UUID)
-      - 5 trending topics
+      - 'trends' array of up to 5 Trend dicts
+        (indexed on trends.normalized_name)
       - Timestamp
       - IP address used
    c. Document inserted into trends collection
+      (legacy trend1..trend5 snapshots are parsed on read and can be
+      converted with: python -m utils.database --backfill)
+   d. Read cache (cache.py) invalidated; latest/by-id lookups are
+      served from an in-process LRU until the next insert or TTL expiry
+   e. TrendEventBus notified (or MongoDB change stream fires)
 
 6. Response Handling:
    a. Success/failure status determined
    b. Data returned to frontend
    c. Frontend updates UI with results
 
+7. Live Updates (events.py):
+   a. Page subscribes once to /trends/stream (Server-Sent Events)
+   b. Each stored snapshot is encoded once and pushed to every viewer
+   c. Viewers never trigger scrapes
+
 Error Handling at Each Stage:
 - Proxy errors: Retry with different proxy from pool
 - Validation errors: Refresh proxy pool
@@ -73,6 +104,14 @@ Error Handling at Each Stage:
 - Database errors: Log error and inform user
 - Network errors: Timeout handling and retry logic
 
+Logging (logger.py):
+- configure_logging() installs one QueueHandler/QueueListener pipeline;
+  callers only enqueue records and a listener thread writes JSON lines
+- Each scrape's unique_id is the correlation_id on every proxy, scraper
+  and database log line emitted while handling it
+- LOG_LEVEL sets the default level, LOG_LEVELS overrides per subsystem
+  (e.g. FreeProxyRotator=WARNING)
+
 Data Flow:
 User → Flask → FreeProxyRotator → TwitterScraper → MongoDB → User
 
@@ -87,8 +126,16 @@ twitter-trends-scraper/
 ├── utils/
 │   ├── __init__.py        # This file
 │   ├── database.py        # MongoDB operations
+│   ├── cache.py           # LRU read cache
+│   ├── events.py          # Live trend pub/sub (SSE)
+│   ├── browser.py         # Chrome process governor
+│   ├── logger.py          # Central logging setup
+│   ├── models.py          # Trend model and parsers
 │   ├── proxy.py          # Free proxy rotation
 │   └── scraper.py        # Selenium scraping
+├── loadtest/
+│   ├── fixture_site.py    # Local X/Twitter stand-in (TWITTER_BASE_URL)
+│   └── run.py             # Load/soak driver and report comparison
 ├── .env                   # Environment variables
 └── app.py                # Main Flask application
 """
@@ -159,7 +206,8 @@ def validate_environment():
         from selenium import webdriver
         from selenium.webdriver.chrome.service import Service
         from webdriver_manager.chrome import ChromeDriverManager
-        webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+        driver.quit()
         status['selenium'] = True
     except:
         pass
@@ -0,0 +1,269 @@
+# utils/browser.py
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psutil
+from config.config import (
+    BROWSER_RSS_LIMIT_MB,
+    BROWSER_TOTAL_RSS_LIMIT_MB,
+    BROWSER_GOVERNOR_INTERVAL
+)
+
+MB = 1024 * 1024
+
+# Process names belonging to a Selenium-driven Chrome tree
+BROWSER_PROCESS_NAMES = ('chromedriver', 'chrome', 'chromium', 'google-chrome')
+
+
+class _TrackedDriver:
+    """Bookkeeping for one WebDriver and the processes it spawned"""
+
+    def __init__(self, driver, root: psutil.Process):
+        self.driver = driver
+        self.root = root
+        self.started = time.time()
+        self.processes: Dict[int, psutil.Process] = {root.pid: root}
+        self.rss = 0
+
+    def refresh(self) -> List[psutil.Process]:
+        """
+        Pick up newly spawned children and drop dead processes. Known
+        processes are remembered so children survive a crashed chromedriver.
+        The map is rebuilt and swapped in whole, never mutated in place, so
+        concurrent sweeps and /stats requests can iterate it safely.
+        """
+        processes = dict(self.processes)
+        try:
+            for child in self.root.children(recursive=True):
+                processes.setdefault(child.pid, child)
+        except psutil.Error:
+            pass
+
+        alive = {pid: p for pid, p in processes.items() if p.is_running()}
+        self.processes = alive
+        return list(alive.values())
+
+
+class BrowserGovernor:
+    """
+    Tracks every Chrome process tree started by TwitterScraper.setup_driver,
+    recycles drivers that exceed the per-driver or global RSS cap and reaps
+    orphaned chrome/chromedriver processes left by failed attempts.
+    """
+
+    def __init__(self, driver_limit_mb: int = 1024, total_limit_mb: int = 2048,
+                 interval: float = 30.0):
+        """
+        Initialize the governor
+        Args:
+            driver_limit_mb: RSS cap for a single driver's process tree
+            total_limit_mb: RSS cap for all tracked browser processes
+            interval: Seconds between background sweeps
+        """
+        self.driver_limit = driver_limit_mb * MB
+        self.total_limit = total_limit_mb * MB
+        self.interval = interval
+        self._drivers: Dict[int, _TrackedDriver] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.recycled = 0
+        self.reaped = 0
+        self.logger = logging.getLogger('BrowserGovernor')
+
+    def start(self):
+        """Reap leftovers from previous runs and start periodic sweeps (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self.reap_orphans()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name='BrowserGovernor',
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error("Browser governor sweep failed: %s", e)
+
+    def register(self, driver):
+        """
+        Start tracking a freshly created WebDriver
+        Args:
+            driver: Selenium Chrome WebDriver
+        """
+        try:
+            root = psutil.Process(driver.service.process.pid)
+        except (AttributeError, psutil.Error) as e:
+            self.logger.warning("Could not track driver process: %s", e)
+            return
+
+        tracked = _TrackedDriver(driver, root)
+        tracked.refresh()
+        with self._lock:
+            self._drivers[id(driver)] = tracked
+
+    def release(self, driver):
+        """
+        Stop tracking a driver and kill anything its tree left behind.
+        Call after driver.quit().
+        """
+        with self._lock:
+            tracked = self._drivers.pop(id(driver), None)
+        if tracked is not None:
+            self._kill(tracked.refresh())
+
+    def recycle(self, driver, reason: str = ''):
+        """Quit a driver and kill its process tree"""
+        with self._lock:
+            tracked = self._drivers.pop(id(driver), None)
+
+        self.logger.warning("Recycling browser driver: %s", reason)
+        processes = tracked.refresh() if tracked is not None else []
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self._kill(processes)
+        self.recycled += 1
+
+    def sample(self) -> List[_TrackedDriver]:
+        """Refresh RSS of every tracked driver tree"""
+        with self._lock:
+            tracked = list(self._drivers.values())
+
+        for entry in tracked:
+            rss = 0
+            for proc in entry.refresh():
+                try:
+                    rss += proc.memory_info().rss
+                except psutil.Error:
+                    pass
+            entry.rss = rss
+        return tracked
+
+    def sweep(self):
+        """Enforce RSS caps and reap orphaned browser processes"""
+        tracked = self.sample()
+
+        survivors = []
+        for entry in tracked:
+            if not entry.processes:
+                # Tree is gone, driver is dead
+                with self._lock:
+                    self._drivers.pop(id(entry.driver), None)
+            elif entry.rss > self.driver_limit:
+                self.recycle(entry.driver, f"driver RSS {entry.rss // MB} MB over {self.driver_limit // MB} MB cap")
+            else:
+                survivors.append(entry)
+
+        # Global cap: recycle the oldest drivers first
+        total = sum(entry.rss for entry in survivors)
+        for entry in sorted(survivors, key=lambda e: e.started):
+            if total <= self.total_limit:
+                break
+            self.recycle(entry.driver, f"total browser RSS {total // MB} MB over {self.total_limit // MB} MB cap")
+            total -= entry.rss
+
+        self.reap_orphans()
+
+    def _tracked_pids(self) -> set:
+        with self._lock:
+            return {pid for entry in self._drivers.values() for pid in entry.processes}
+
+    def reap_orphans(self) -> int:
+        """
+        Kill browser processes not owned by a tracked driver that are older
+        than the start-up grace period and either orphaned (parent gone or
+        reparented to init) or left as direct children of this process.
+        Returns:
+            Number of processes killed
+        """
+        tracked = self._tracked_pids()
+        me = os.getpid()
+        user = psutil.Process(me).username()
+        grace_cutoff = time.time() - 60
+        orphans = []
+
+        for proc in psutil.process_iter(['pid', 'ppid', 'name', 'username', 'create_time']):
+            info = proc.info
+            name = (info['name'] or '').lower()
+            if info['pid'] in tracked or not name.startswith(BROWSER_PROCESS_NAMES):
+                continue
+            if info['username'] != user:
+                continue
+
+            # Anything still starting up may not be registered yet
+            if (info['create_time'] or 0) > grace_cutoff:
+                continue
+
+            # An untracked direct child is a leaked chromedriver, or (when we
+            # run as PID 1 and inherit orphans) a Chrome whose driver died
+            if info['ppid'] == me:
+                leaked = name.startswith('chromedriver') or self._is_automation_chrome(proc)
+            else:
+                parent_gone = info['ppid'] == 1 or not psutil.pid_exists(info['ppid'])
+                leaked = parent_gone and (name.startswith('chromedriver') or self._is_automation_chrome(proc))
+            if leaked:
+                orphans.append(proc)
+
+        if orphans:
+            self.logger.warning("Reaping %s orphaned browser processes", len(orphans))
+            self._kill(orphans)
+            self.reaped += len(orphans)
+        return len(orphans)
+
+    @staticmethod
+    def _is_automation_chrome(proc: psutil.Process) -> bool:
+        """Only touch Chrome instances started by chromedriver, never a user's browser"""
+        try:
+            return any(arg.startswith('--remote-debugging-port') for arg in proc.cmdline())
+        except psutil.Error:
+            return False
+
+    def _kill(self, processes: List[psutil.Process]):
+        for proc in processes:
+            try:
+                proc.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(processes, timeout=5)
+
+    def stats(self) -> Dict:
+        """
+        Current browser usage
+        Returns:
+            Dict with driver/process counts, RSS in MB and recycle/reap totals
+        """
+        tracked = self.sample()
+        return {
+            'drivers': len(tracked),
+            'processes': sum(len(entry.processes) for entry in tracked),
+            'rss_mb': round(sum(entry.rss for entry in tracked) / MB, 1),
+            'driver_rss_mb': [round(entry.rss / MB, 1) for entry in tracked],
+            'driver_limit_mb': self.driver_limit // MB,
+            'total_limit_mb': self.total_limit // MB,
+            'recycled': self.recycled,
+            'reaped': self.reaped
+        }
+
+
+# Process-wide governor used by the scraper and the Flask app
+browser_governor = BrowserGovernor(
+    driver_limit_mb=BROWSER_RSS_LIMIT_MB,
+    total_limit_mb=BROWSER_TOTAL_RSS_LIMIT_MB,
+    interval=BROWSER_GOVERNOR_INTERVAL
+)
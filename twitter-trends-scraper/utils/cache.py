@@ -0,0 +1,88 @@
+# utils/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class ReadCache:
+    """
+    Thread-safe in-process LRU cache for database reads.
+    Entries expire after ttl seconds so writes from other processes are
+    picked up; local writes call invalidate() to drop everything at once.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0):
+        """
+        Initialize the cache
+        Args:
+            max_entries: Maximum cached results before the least recently used is evicted
+            ttl: Seconds a cached result stays valid (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], cache_none: bool = True) -> Any:
+        """
+        Return the cached value for key, calling loader on a miss
+        Args:
+            key: Hashable cache key
+            loader: Zero-argument callable that reads from the database
+            cache_none: Whether a None result is cached (False for lookups
+                        whose document may be inserted by another worker)
+        Returns:
+            Cached or freshly loaded value; treat it as read-only
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+
+        if self.ttl > 0 and (cache_none or value is not None):
+            with self._lock:
+                # Skip storing if a write invalidated the cache mid-read
+                if generation == self._generation:
+                    self._entries[key] = (now + self.ttl, value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        """
+        Cache effectiveness
+        Returns:
+            Dict with size, hits, misses, hit rate and invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'invalidations': self.invalidations
+            }
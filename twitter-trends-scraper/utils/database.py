@@ -1,9 +1,58 @@
 # utils/database.py
 
-from pymongo import MongoClient
-from datetime import datetime
+from pymongo import MongoClient, UpdateOne
+from datetime import datetime, timedelta
 import logging
-from config.config import MONGODB_URI, DB_NAME
+import threading
+from config.config import (
+    MONGODB_URI,
+    DB_NAME,
+    MONGODB_MAX_POOL_SIZE,
+    MONGODB_MIN_POOL_SIZE,
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+    MONGODB_CONNECT_TIMEOUT_MS,
+    MONGODB_SOCKET_TIMEOUT_MS,
+    MONGODB_COMPRESSORS,
+    MONGODB_RETRY_WRITES,
+    DB_CACHE_SIZE,
+    DB_CACHE_TTL
+)
+from utils.cache import ReadCache
+from utils.events import trend_events
+from utils.logger import configure_logging
+from utils.models import Trend, LEGACY_FIELDS, legacy_fragments, parse_trends, parse_trends_bulk
+
+_client = None
+_client_lock = threading.Lock()
+
+# Shared by every MongoDB instance so a write through one invalidates reads through all
+read_cache = ReadCache(max_entries=DB_CACHE_SIZE, ttl=DB_CACHE_TTL)
+
+# Inserts by other workers arrive through the change stream (TRENDS_CHANGE_STREAM)
+trend_events.add_insert_listener(lambda document: read_cache.invalidate())
+
+def get_client():
+    """
+    Process-wide MongoClient; all MongoDB instances share its connection pool
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                options = {
+                    'maxPoolSize': MONGODB_MAX_POOL_SIZE,
+                    'minPoolSize': MONGODB_MIN_POOL_SIZE,
+                    'serverSelectionTimeoutMS': MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                    'connectTimeoutMS': MONGODB_CONNECT_TIMEOUT_MS,
+                    'socketTimeoutMS': MONGODB_SOCKET_TIMEOUT_MS,
+                    'retryWrites': MONGODB_RETRY_WRITES,
+                    'appname': 'twitter-trends-scraper'
+                }
+                if MONGODB_COMPRESSORS:
+                    options['compressors'] = MONGODB_COMPRESSORS
+                _client = MongoClient(MONGODB_URI, **options)
+    return _client
 
 class MongoDB:
     """
@@ -14,20 +63,25 @@ class MongoDB:
         """Initialize MongoDB connection"""
         self.setup_logging()
         try:
-            self.client = MongoClient(MONGODB_URI)
+            self.client = get_client()
             self.db = self.client[DB_NAME]
             self.collection = self.db['config']
             self.logger.info("Successfully connected to MongoDB")
         except Exception as e:
-            self.logger.error(f"Failed to connect to MongoDB: {str(e)}")
+            self.logger.error("Failed to connect to MongoDB: %s", e)
             raise
+        self.ensure_indexes()
+
+    def ensure_indexes(self):
+        """Create indexes used by trend lookups; failures are logged, not fatal"""
+        try:
+            self.collection.create_index('trends.normalized_name')
+        except Exception as e:
+            self.logger.warning("Failed to create indexes: %s", e)
     
     def setup_logging(self):
         """Set up logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        configure_logging()
         self.logger = logging.getLogger('MongoDB')
     
     def insert_trends(self, data):
@@ -37,20 +91,31 @@ class MongoDB:
         Args:
             data: Dictionary containing trend data with fields:
                 - unique_id: Unique identifier for the scrape
-                - trend1-5: The trending topics
+                - trends: List of Trend objects (or their dicts)
                 - timestamp: When the data was collected
                 - ip_address: IP used for scraping
         """
         try:
             # Add metadata
             data['created_at'] = datetime.now()
+
+            document = dict(data)
+            document['trends'] = [
+                trend.to_dict() if isinstance(trend, Trend) else trend
+                for trend in data.get('trends', [])
+            ]
             
             # Insert document
-            result = self.collection.insert_one(data)
-            self.logger.info(f"Successfully inserted trends with ID: {result.inserted_id}")
+            result = self.collection.insert_one(document)
+            data['_id'] = result.inserted_id
+            read_cache.invalidate()
+            self.logger.info("Successfully inserted trends with ID: %s", result.inserted_id)
+
+            # Notify live stream subscribers
+            trend_events.notify_inserted(document)
             return result.inserted_id
         except Exception as e:
-            self.logger.error(f"Failed to insert trends: {str(e)}")
+            self.logger.error("Failed to insert trends: %s", e)
             raise
     
     def get_latest_trends(self, limit=10):
@@ -60,15 +125,18 @@ class MongoDB:
         Args:
             limit: Number of entries to return
         Returns:
-            List of trend documents
+            List of trend documents (cached; do not mutate)
         """
         try:
-            return list(self.collection
-                       .find({})
-                       .sort('created_at', -1)
-                       .limit(limit))
+            return read_cache.get_or_load(
+                ('latest', limit),
+                lambda: list(self.collection
+                             .find({})
+                             .sort('created_at', -1)
+                             .limit(limit))
+            )
         except Exception as e:
-            self.logger.error(f"Failed to fetch latest trends: {str(e)}")
+            self.logger.error("Failed to fetch latest trends: %s", e)
             raise
     
     def get_trends_by_id(self, unique_id):
@@ -78,14 +146,79 @@ class MongoDB:
         Args:
             unique_id: The unique identifier of the scrape
         Returns:
-            Trend document or None if not found
+            Trend document or None if not found (cached; do not mutate)
         """
         try:
-            return self.collection.find_one({'unique_id': unique_id})
+            return read_cache.get_or_load(
+                ('id', unique_id),
+                lambda: self.collection.find_one({'unique_id': unique_id}),
+                cache_none=False
+            )
         except Exception as e:
-            self.logger.error(f"Failed to fetch trends by ID: {str(e)}")
+            self.logger.error("Failed to fetch trends by ID: %s", e)
             raise
 
+    def get_trend_history(self, name, limit=50):
+        """
+        Get the most recent snapshots containing a trend
+        
+        Args:
+            name: Trend name in any casing, with or without '#'
+            limit: Number of snapshots to return
+        Returns:
+            List of trend documents
+        """
+        try:
+            return list(self.collection
+                       .find({'trends.normalized_name': Trend.normalize_name(name)})
+                       .sort('created_at', -1)
+                       .limit(limit))
+        except Exception as e:
+            self.logger.error("Failed to fetch trend history: %s", e)
+            raise
+
+    def backfill_trends(self, batch_size=1000):
+        """
+        Add typed 'trends' arrays to snapshots stored as trend1..trend5
+        
+        Args:
+            batch_size: Documents parsed and written per round trip
+        Returns:
+            Number of documents updated
+        """
+        updated = 0
+        try:
+            cursor = self.collection.find(
+                {'trends': {'$exists': False}},
+                {field: 1 for field in LEGACY_FIELDS}
+            ).batch_size(batch_size)
+
+            batch = []
+            for document in cursor:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    updated += self._backfill_batch(batch)
+                    batch = []
+            if batch:
+                updated += self._backfill_batch(batch)
+
+            if updated:
+                read_cache.invalidate()
+            self.logger.info("Backfilled %s trend documents", updated)
+            return updated
+        except Exception as e:
+            self.logger.error("Failed to backfill trends: %s", e)
+            raise
+
+    def _backfill_batch(self, documents):
+        parsed = parse_trends_bulk([legacy_fragments(document) for document in documents])
+        operations = [
+            UpdateOne({'_id': document['_id']}, {'$set': {'trends': [trend.to_dict() for trend in trends]}})
+            for document, trends in zip(documents, parsed)
+        ]
+        result = self.collection.bulk_write(operations, ordered=False)
+        return result.modified_count
+
     def cleanup_old_records(self, days=30):
         """
         Remove records older than specified days
@@ -98,30 +231,42 @@ class MongoDB:
             result = self.collection.delete_many({
                 'created_at': {'$lt': cutoff_date}
             })
-            self.logger.info(f"Removed {result.deleted_count} old records")
+            if result.deleted_count:
+                read_cache.invalidate()
+            self.logger.info("Removed %s old records", result.deleted_count)
         except Exception as e:
-            self.logger.error(f"Failed to cleanup old records: {str(e)}")
+            self.logger.error("Failed to cleanup old records: %s", e)
             raise
 
 if __name__ == '__main__':
-    # Test database connection and operations
+    import argparse
+
+    parser = argparse.ArgumentParser(description='MongoDB maintenance for stored trends')
+    parser.add_argument('--backfill', action='store_true',
+                        help='Convert legacy trend1..trend5 snapshots to typed trends arrays')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
     try:
         db = MongoDB()
         print("Successfully connected to MongoDB")
-        
-        # Test insert
-        test_data = {
-            'unique_id': 'test-123',
-            'trend1': 'Test Trend 1',
-            'trend2': 'Test Trend 2',
-            'trend3': 'Test Trend 3',
-            'trend4': 'Test Trend 4',
-            'trend5': 'Test Trend 5',
-            'timestamp': datetime.now(),
-            'ip_address': '127.0.0.1'
-        }
-        db.insert_trends(test_data)
-        print("Successfully inserted test data")
-        
+
+        if args.backfill:
+            updated = db.backfill_trends(batch_size=args.batch_size)
+            print(f"Backfilled {updated} trend documents")
+        else:
+            # Test insert
+            test_data = {
+                'unique_id': 'test-123',
+                'trends': parse_trends([
+                    'Trending in India\nTest Trend 1\n12.3K posts',
+                    'Sports · Trending\nTest Trend 2\n1,234 posts'
+                ]),
+                'timestamp': datetime.now(),
+                'ip_address': '127.0.0.1'
+            }
+            db.insert_trends(test_data)
+            print("Successfully inserted test data")
+
     except Exception as e:
-        print(f"Error: {str(e)}")
\ No newline at end of file
+        print(f"Error: {str(e)}")
@@ -0,0 +1,184 @@
+# utils/events.py
+
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from bson import ObjectId
+from pymongo.errors import OperationFailure
+from config.config import SSE_KEEPALIVE_SECONDS
+
+
+def json_default(obj):
+    """
+    Encode the BSON/datetime values found in stored trend documents.
+    Shared by SSE frames and the Flask JSON provider.
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class TrendEventBus:
+    """
+    In-process pub/sub for newly stored trend snapshots.
+    Each snapshot is encoded once and fanned out to every subscriber queue,
+    so the cost of an extra viewer is one queue put per snapshot.
+    """
+
+    def __init__(self, max_queue: int = 16, keepalive: float = 15.0):
+        """
+        Initialize the event bus
+        Args:
+            max_queue: Maximum pending events per subscriber before the oldest is dropped
+            keepalive: Seconds between SSE keepalive comments on an idle stream
+        """
+        self.max_queue = max_queue
+        self.keepalive = keepalive
+        self._subscribers: Set[queue.Queue] = set()
+        self._lock = threading.Lock()
+        self._last_event: Optional[str] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stream_open = threading.Event()
+        self._insert_listeners: List[Callable[[Dict], None]] = []
+        self.logger = logging.getLogger('TrendEventBus')
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def watching(self) -> bool:
+        """True while an open MongoDB change stream is feeding the bus"""
+        return self._stream_open.is_set()
+
+    def subscribe(self) -> queue.Queue:
+        """Register a subscriber, primed with the latest snapshot if one exists"""
+        q = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            if self._last_event is not None:
+                q.put_nowait(self._last_event)
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, document: Dict):
+        """
+        Encode a trend document as an SSE frame and deliver it to all subscribers
+        Args:
+            document: Stored trend document
+        """
+        payload = json.dumps(document, default=json_default)
+        frame = f"id: {document.get('unique_id', '')}\nevent: trends\ndata: {payload}\n\n"
+
+        with self._lock:
+            self._last_event = frame
+            subscribers = list(self._subscribers)
+
+        for q in subscribers:
+            try:
+                q.put_nowait(frame)
+            except queue.Full:
+                # Slow viewer: drop its oldest pending snapshot, keep the newest
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    q.put_nowait(frame)
+                except queue.Full:
+                    pass
+
+    def add_insert_listener(self, callback: Callable[[Dict], None]):
+        """
+        Call back on every insert delivered by the change stream, including
+        inserts made by other workers
+        Args:
+            callback: Receives the inserted document
+        """
+        self._insert_listeners.append(callback)
+
+    def notify_inserted(self, document: Dict):
+        """
+        Called after a snapshot is stored locally. When a change stream is
+        running it delivers the insert instead, so skip to avoid duplicates.
+        """
+        if not self.watching:
+            self.publish(document)
+
+    def watch(self, collection):
+        """
+        Feed the bus from a MongoDB change stream so inserts made by any
+        worker reach this process's subscribers. Requires a replica set;
+        while the stream is not open the bus uses local notifications and
+        the watcher keeps reconnecting with backoff.
+        Args:
+            collection: pymongo Collection holding trend snapshots
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+
+        self._watcher = threading.Thread(
+            target=self._watch_loop,
+            args=(collection,),
+            name='TrendEventBusWatcher',
+            daemon=True
+        )
+        self._watcher.start()
+
+    def _watch_loop(self, collection):
+        pipeline = [{'$match': {'operationType': 'insert'}}]
+        resume_token = None
+        delay = 1.0
+
+        while True:
+            try:
+                with collection.watch(pipeline, resume_after=resume_token) as stream:
+                    self._stream_open.set()
+                    delay = 1.0
+                    self.logger.info("Watching MongoDB change stream for new trends")
+                    for change in stream:
+                        resume_token = stream.resume_token
+                        for callback in self._insert_listeners:
+                            callback(change['fullDocument'])
+                        self.publish(change['fullDocument'])
+            except Exception as e:
+                if isinstance(e, OperationFailure):
+                    # Token may have fallen off the oplog; start from now
+                    resume_token = None
+                self.logger.warning("Change stream unavailable, using local notifications "
+                                    "and retrying in %ss: %s", delay, e)
+            finally:
+                self._stream_open.clear()
+
+            time.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+    def stream(self) -> Iterator[str]:
+        """
+        Generator of SSE frames for one client; blocks between events
+        and emits a keepalive comment when idle
+        """
+        q = self.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield q.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(q)
+
+
+# Process-wide bus shared by the database layer and the Flask app
+trend_events = TrendEventBus(keepalive=SSE_KEEPALIVE_SECONDS)
@@ -0,0 +1,150 @@
+# utils/logger.py
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from config.config import LOG_LEVEL, LOG_LEVELS, LOG_FORMAT
+
+# Correlation ID of the scrape being handled on the current thread/context
+correlation_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('correlation_id', default=None)
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'correlation_id'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamp records with the current correlation ID before they leave the calling thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'correlation_id'):
+            record.correlation_id = correlation_id.get()
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps the traceback in exc_text instead of folding it
+    into msg, so the listener's formatter can emit it as its own field
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'correlation_id': getattr(record, 'correlation_id', None),
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """
+    Parse per-subsystem levels
+    Args:
+        spec: Comma separated 'LoggerName=LEVEL' pairs, e.g. 'FreeProxyRotator=WARNING'
+    Returns:
+        Dict mapping logger name to level name; unknown levels are skipped
+    """
+    levels = {}
+    for item in spec.split(','):
+        name, sep, level = item.partition('=')
+        if sep and name.strip() and is_valid_level(level.strip()):
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def is_valid_level(level: str) -> bool:
+    return isinstance(logging.getLevelName(level.upper()), int)
+
+
+def configure_logging():
+    """
+    Install the process-wide logging pipeline (idempotent).
+    Callers only enqueue records; a QueueListener thread formats and
+    writes them to stdout so log I/O stays off the request path.
+    """
+    global _listener
+
+    with _lock:
+        if _listener is not None:
+            return
+
+        stream = logging.StreamHandler(sys.stdout)
+        if LOG_FORMAT == 'json':
+            stream.setFormatter(JsonFormatter())
+        else:
+            stream.setFormatter(logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(message)s'
+            ))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = StructuredQueueHandler(log_queue)
+        queue_handler.addFilter(CorrelationFilter())
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(LOG_LEVEL.upper() if is_valid_level(LOG_LEVEL) else logging.INFO)
+
+        levels = parse_levels(LOG_LEVELS)
+        for name, level in levels.items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+    logger = logging.getLogger(__name__)
+    if not is_valid_level(LOG_LEVEL):
+        logger.warning("Ignoring unknown LOG_LEVEL %r, using INFO", LOG_LEVEL)
+    ignored = [item for item in LOG_LEVELS.split(',') if item.strip() and item.partition('=')[0].strip() not in levels]
+    if ignored:
+        logger.warning("Ignoring invalid LOG_LEVELS entries: %s", ignored)
+
+
+@contextmanager
+def correlation_scope(value: Optional[str]):
+    """
+    Tag every log line emitted inside the block with a correlation ID
+    Args:
+        value: Usually the scrape's unique_id
+    """
+    token = correlation_id.set(value)
+    try:
+        yield
+    finally:
+        correlation_id.reset(token)
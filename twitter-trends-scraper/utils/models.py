@@ -0,0 +1,218 @@
+# utils/models.py
+
+import re
+import unicodedata
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# "12.3K posts", "1,234 posts", "2M Tweets"
+POST_COUNT_PATTERN = r'^\s*([\d][\d,]*(?:\.\d+)?)\s*([KMB])?\s+(?:posts?|tweets?)\s*$'
+# "Trending in India", "Sports · Trending", "Promoted by ..."
+CONTEXT_PATTERN = r'(?:^trending\b|·|^promoted\b)'
+
+_POST_COUNT_RE = re.compile(POST_COUNT_PATTERN, re.IGNORECASE)
+_CONTEXT_RE = re.compile(CONTEXT_PATTERN, re.IGNORECASE)
+_SUFFIX_MULTIPLIERS = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+# Line kinds produced by classification
+NAME, CONTEXT, POSTS = 0, 1, 2
+
+
+@dataclass(slots=True)
+class Trend:
+    """A single trending topic as shown in the 'What's happening' panel"""
+
+    rank: int
+    name: str
+    normalized_name: str
+    category: Optional[str] = None
+    post_count: Optional[int] = None
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """Casefolded, NFKC-normalized name without leading '#' and extra whitespace"""
+        text = unicodedata.normalize('NFKC', name).casefold().lstrip('#')
+        return ' '.join(text.split())
+
+    @staticmethod
+    def parse_post_count(text: str) -> Optional[int]:
+        """
+        Parse a post count line
+        Args:
+            text: e.g. '12.3K posts'
+        Returns:
+            Integer count or None if the text is not a post count
+        """
+        match = _POST_COUNT_RE.match(text)
+        if not match:
+            return None
+        number, suffix = match.groups()
+        return int(round(float(number.replace(',', '')) * _SUFFIX_MULTIPLIERS.get((suffix or '').upper(), 1)))
+
+    @staticmethod
+    def parse_category(text: str) -> str:
+        """'Sports · Trending' -> 'Sports'; other context lines are kept as-is"""
+        parts = [part.strip() for part in text.split('·')]
+        parts = [part for part in parts if part and part.lower() != 'trending']
+        return parts[0] if parts else text.strip()
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Trend':
+        return cls(
+            rank=data['rank'],
+            name=data['name'],
+            normalized_name=data.get('normalized_name') or cls.normalize_name(data['name']),
+            category=data.get('category'),
+            post_count=data.get('post_count')
+        )
+
+
+def classify_line(line: str) -> int:
+    if _POST_COUNT_RE.match(line):
+        return POSTS
+    if _CONTEXT_RE.search(line):
+        return CONTEXT
+    return NAME
+
+
+def _split_lines(fragments: Iterable[str]) -> List[str]:
+    return [line.strip() for fragment in fragments if fragment for line in fragment.splitlines() if line.strip()]
+
+
+def _assemble(lines: Sequence[str], kinds: Sequence[int], counts: Sequence[Optional[int]],
+              normalized: Sequence[str], categories: Sequence[Optional[str]],
+              limit: Optional[int]) -> List[Trend]:
+    """
+    Group classified lines into trends. A trend is an optional context line,
+    a name and an optional post count; a new context or name line after a
+    name starts the next trend.
+    """
+    trends: List[Trend] = []
+    category = None
+    current: Optional[Trend] = None
+
+    for line, kind, count, norm, context in zip(lines, kinds, counts, normalized, categories):
+        if kind == CONTEXT:
+            current = None
+            category = context
+        elif kind == POSTS:
+            if current is not None and current.post_count is None:
+                current.post_count = count
+        else:
+            if limit is not None and len(trends) >= limit:
+                break
+            current = Trend(len(trends) + 1, line, norm, category)
+            trends.append(current)
+            category = None
+
+    return trends
+
+
+def parse_trends(fragments: Iterable[str], limit: Optional[int] = 5) -> List[Trend]:
+    """
+    Build Trend objects from the raw texts of the trends panel
+    Args:
+        fragments: Trend cell texts (multi-line) or individual line texts
+        limit: Maximum number of trends to return
+    Returns:
+        Ranked list of Trend objects
+    """
+    lines = _split_lines(fragments)
+    kinds = [classify_line(line) for line in lines]
+    counts = [Trend.parse_post_count(line) if kind == POSTS else None for line, kind in zip(lines, kinds)]
+    normalized = [Trend.normalize_name(line) if kind == NAME else '' for line, kind in zip(lines, kinds)]
+    categories = [Trend.parse_category(line) if kind == CONTEXT else None for line, kind in zip(lines, kinds)]
+    return _assemble(lines, kinds, counts, normalized, categories, limit)
+
+
+def parse_trends_bulk(documents_fragments: Sequence[Sequence[str]], limit: Optional[int] = 5) -> List[List[Trend]]:
+    """
+    Vectorized parse of many snapshots at once, for backfilling history.
+    History repeats the same trend texts across many snapshots, so lines are
+    factorized first and classified, counted and normalized once per
+    distinct text with pandas string operations; only the cheap grouping
+    step runs per snapshot.
+    Args:
+        documents_fragments: One list of raw trend texts per snapshot
+        limit: Maximum number of trends per snapshot
+    Returns:
+        One ranked list of Trend objects per snapshot, in input order
+    """
+    import numpy as np
+    import pandas as pd
+
+    per_doc_lines = [_split_lines(fragments) for fragments in documents_fragments]
+    flat = [line for doc in per_doc_lines for line in doc]
+    if not flat:
+        return [[] for _ in per_doc_lines]
+
+    codes, uniques = pd.factorize(pd.Series(flat, dtype='object'))
+    lines = pd.Series(uniques, dtype='object')
+
+    extracted = lines.str.extract(POST_COUNT_PATTERN, flags=re.IGNORECASE)
+    is_posts = extracted[0].notna()
+    is_context = ~is_posts & lines.str.contains(CONTEXT_PATTERN, flags=re.IGNORECASE, regex=True)
+    kinds = (is_posts.astype(int) * POSTS + is_context.astype(int) * CONTEXT).to_numpy()
+
+    multipliers = extracted[1].str.upper().map(_SUFFIX_MULTIPLIERS).fillna(1)
+    numbers = pd.to_numeric(extracted[0].str.replace(',', '', regex=False), errors='coerce')
+    counts = np.array([int(c) if c == c else None for c in (numbers * multipliers).round()], dtype=object)
+
+    normalized = (lines.str.normalize('NFKC')
+                  .str.casefold()
+                  .str.lstrip('#')
+                  .str.split()
+                  .str.join(' ')).to_numpy(dtype=object)
+
+    categories = np.full(len(lines), None, dtype=object)
+    context_idx = np.flatnonzero(kinds == CONTEXT)
+    categories[context_idx] = [Trend.parse_category(line) for line in lines.iloc[context_idx]]
+
+    # Expand per-distinct-line results back to every line, in input order
+    flat_kinds = kinds[codes].tolist()
+    flat_counts = counts[codes].tolist()
+    flat_normalized = normalized[codes].tolist()
+    flat_categories = categories[codes].tolist()
+
+    results = []
+    start = 0
+    for doc in per_doc_lines:
+        end = start + len(doc)
+        results.append(_assemble(
+            flat[start:end],
+            flat_kinds[start:end],
+            flat_counts[start:end],
+            flat_normalized[start:end],
+            flat_categories[start:end],
+            limit
+        ))
+        start = end
+    return results
+
+
+LEGACY_FIELDS = tuple(f'trend{i}' for i in range(1, 6))
+
+
+def legacy_fragments(document: Dict) -> List[str]:
+    """Raw texts of a pre-model snapshot stored as trend1..trend5"""
+    return [document[field] for field in LEGACY_FIELDS if document.get(field)]
+
+
+def trends_from_document(document: Dict) -> List[Trend]:
+    """Trend objects of a stored snapshot, parsing legacy trend1..trend5 fields if needed"""
+    if document.get('trends'):
+        return [Trend.from_dict(item) for item in document['trends']]
+    return parse_trends(legacy_fragments(document))
+
+
+def snapshot_to_dict(document: Dict) -> Dict:
+    """
+    Response shape of a stored snapshot: legacy trend1..trend5 fields are
+    replaced by a parsed 'trends' list. The input document is not modified.
+    """
+    snapshot = {key: value for key, value in document.items() if key not in LEGACY_FIELDS}
+    snapshot['trends'] = [trend.to_dict() for trend in trends_from_document(document)]
+    return snapshot
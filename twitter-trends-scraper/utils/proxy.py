@@ -8,6 +8,7 @@ import random
 import concurrent.futures
 from typing import List, Dict
 import time
+from utils.logger import configure_logging
 
 class FreeProxyRotator:
     """
@@ -29,10 +30,7 @@ class FreeProxyRotator:
     
     def setup_logging(self):
         """Set up logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        configure_logging()
         self.logger = logging.getLogger('FreeProxyRotator')
 
     def fetch_proxy_list(self) -> List[Dict]:
@@ -64,7 +62,7 @@ class FreeProxyRotator:
                         }
                         proxies.append(proxy)
         except Exception as e:
-            self.logger.error(f"Error fetching from free-proxy-list.net: {str(e)}")
+            self.logger.error("Error fetching from free-proxy-list.net: %s", e)
 
         # Source 2: geonode free proxies
         try:
@@ -80,7 +78,7 @@ class FreeProxyRotator:
                     }
                     proxies.append(proxy_dict)
         except Exception as e:
-            self.logger.error(f"Error fetching from geonode: {str(e)}")
+            self.logger.error("Error fetching from geonode: %s", e)
 
         return proxies
 
@@ -133,17 +131,17 @@ class FreeProxyRotator:
                 try:
                     if future.result():
                         working_proxies.append(proxy)
-                        self.logger.info(f"Found working proxy: {proxy['ip']}:{proxy['port']}")
+                        self.logger.debug("Found working proxy: %s:%s", proxy['ip'], proxy['port'])
                         
                         # Break if we have enough working proxies
                         if len(working_proxies) >= self.min_proxies:
                             break
                 except Exception as e:
-                    self.logger.error(f"Error validating proxy: {str(e)}")
+                    self.logger.error("Error validating proxy: %s", e)
 
         self.working_proxies = working_proxies
         self.proxy_cycle = cycle(working_proxies)
-        self.logger.info(f"Found {len(working_proxies)} working proxies")
+        self.logger.info("Found %s working proxies", len(working_proxies))
 
     def get_next_proxy(self) -> Dict:
         """
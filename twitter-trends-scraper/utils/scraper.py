@@ -4,38 +4,58 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from utils.proxy import FreeProxyRotator
 from utils.database import MongoDB
+from utils.browser import browser_governor
+from utils.models import parse_trends
+from utils.logger import configure_logging, correlation_scope
 import time
 import logging
 import random
 import uuid
 from datetime import datetime
-from config.config import TWITTER_USERNAME, TWITTER_PASSWORD
+from config.config import TWITTER_USERNAME, TWITTER_PASSWORD, TWITTER_BASE_URL, USE_PROXIES
 from pyvirtualdisplay import Display
 
+class ScrapeError(Exception):
+    """
+    Raised when every scrape attempt failed. cause is one of 'driver',
+    'login', 'no_trends' or 'db' for the stage the last attempt failed in.
+    """
+
+    def __init__(self, cause, message):
+        super().__init__(message)
+        self.cause = cause
+
+
+# Stage of an attempt -> cause reported when a page element is missing there
+STAGE_CAUSES = {'driver': 'driver', 'login': 'login', 'trends': 'no_trends', 'db': 'db'}
+
 class TwitterScraper:
     def __init__(self):
         self.setup_logging()
         try:
             self.db = MongoDB()
-            self.proxy_rotator = FreeProxyRotator()
+            self.proxy_rotator = FreeProxyRotator() if USE_PROXIES else None
             self.current_ip = None
+            browser_governor.start()
             self.logger.info("Successfully initialized TwitterScraper with MongoDB connection")
         except Exception as e:
-            self.logger.error(f"Failed to initialize TwitterScraper: {str(e)}")
+            self.logger.error("Failed to initialize TwitterScraper: %s", e)
             raise
 
     def setup_logging(self):
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
+        configure_logging()
         self.logger = logging.getLogger('TwitterScraper')
 
     def setup_driver(self):
-        """Set up Chrome driver with anti-detection options"""
+        """
+        Set up Chrome driver with anti-detection options
+        Returns:
+            Tuple of (driver, IP the driver goes out through or 'direct')
+        """
         chrome_options = Options()
         # Basic options
         chrome_options.add_argument('--no-sandbox')
@@ -59,23 +79,37 @@ class TwitterScraper:
         chrome_options.page_load_strategy = 'eager'
 
         # Add proxy if available
-        try:
-            proxy = self.proxy_rotator.get_next_proxy()
-            self.current_ip = proxy['ip']
-            chrome_options.add_argument(f'--proxy-server={proxy["proxy_host"]}')
-        except Exception as e:
-            self.logger.warning(f"Failed to get proxy, continuing without proxy: {str(e)}")
-            self.current_ip = 'direct'
+        ip = 'direct'
+        if self.proxy_rotator is not None:
+            try:
+                proxy = self.proxy_rotator.get_next_proxy()
+                ip = proxy['ip']
+                chrome_options.add_argument(f'--proxy-server={proxy["proxy_host"]}')
+            except Exception as e:
+                self.logger.warning("Failed to get proxy, continuing without proxy: %s", e)
+        # Most recent IP, informational only; callers use the returned ip
+        self.current_ip = ip
 
         driver = webdriver.Chrome(
             service=Service(ChromeDriverManager().install()),
             options=chrome_options
         )
 
-        # Additional anti-detection measures
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        browser_governor.register(driver)
 
-        return driver
+        try:
+            # Additional anti-detection measures
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        except Exception:
+            # The caller never sees this driver, so shut its tree down here
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            browser_governor.release(driver)
+            raise
+
+        return driver, ip
 
     def human_like_delay(self, min_seconds=2, max_seconds=4):
         """Add random delay to simulate human behavior"""
@@ -104,19 +138,47 @@ class TwitterScraper:
             return False
 
         except Exception as e:
-            self.logger.error(f"Error checking login status: {str(e)}")
+            self.logger.error("Error checking login status: %s", e)
             return False
 
-    def get_trends(self, max_retries=3):
+    @staticmethod
+    def failure_cause(stage, error):
+        """Missing elements blame the stage; other WebDriver errors mean the browser failed"""
+        if isinstance(error, (TimeoutException, NoSuchElementException)):
+            return STAGE_CAUSES[stage]
+        if isinstance(error, WebDriverException):
+            return 'driver'
+        return STAGE_CAUSES[stage]
+
+    def get_trends(self, max_retries=3, unique_id=None):
+        """
+        Scrape and store the top 5 trends
+        Args:
+            max_retries: Number of browser attempts before giving up
+            unique_id: Scrape ID, also used as the log correlation ID
+        Returns:
+            The stored snapshot: unique_id, trends (Trend objects),
+            timestamp, ip_address, created_at and _id
+        Raises:
+            ScrapeError: when all attempts fail, with the failure cause
+        """
+        unique_id = unique_id or str(uuid.uuid4())
+        with correlation_scope(unique_id):
+            return self._get_trends(max_retries, unique_id)
+
+    def _get_trends(self, max_retries, unique_id):
         for attempt in range(max_retries):
             driver = None
+            stage = 'driver'
             try:
-                self.logger.info(f"Attempt {attempt + 1} of {max_retries}")
-                driver = self.setup_driver()
+                self.logger.info("Attempt %s of %s", attempt + 1, max_retries)
+                driver, ip = self.setup_driver()
                 driver.set_page_load_timeout(30)
 
+                stage = 'login'
+
                 self.logger.info("Navigating to X.com login page")
-                driver.get('https://twitter.com/i/flow/login')
+                driver.get(f'{TWITTER_BASE_URL}/i/flow/login')
                 self.human_like_delay(3, 5)
 
                 self.logger.info("Attempting to log in")
@@ -157,8 +219,9 @@ class TwitterScraper:
                 if not self.check_login_success(driver):
                     raise Exception("Login verification failed")
 
+                stage = 'trends'
                 self.logger.info("Navigating to home page")
-                driver.get('https://twitter.com/home')
+                driver.get(f'{TWITTER_BASE_URL}/home')
                 self.human_like_delay(3, 5)
 
                 self.logger.info("Locating 'Search' section")
@@ -171,53 +234,58 @@ class TwitterScraper:
 
                 trends_container = whats_happening_label.find_element(By.XPATH, "./ancestor::div/following-sibling::div")
 
-                trend_elements = trends_container.find_elements(By.CSS_SELECTOR, "div[dir='auto']")
-                trends = [trend.text.strip() for trend in trend_elements if trend.text.strip()]
+                # Whole trend cells keep context, name and post count together;
+                # fall back to individual text fragments if the cells are missing
+                trend_elements = trends_container.find_elements(By.CSS_SELECTOR, "div[data-testid='trend']")
+                if not trend_elements:
+                    trend_elements = trends_container.find_elements(By.CSS_SELECTOR, "div[dir='auto']")
+                trends = parse_trends(element.text for element in trend_elements)
 
                 if trends:
-                    self.logger.info(f"Successfully retrieved {len(trends[:5])} trends")
+                    self.logger.info("Successfully retrieved %s trends", len(trends))
 
                     trend_data = {
-                        'unique_id': str(uuid.uuid4()),
+                        'unique_id': unique_id,
+                        'trends': trends,
                         'timestamp': datetime.now(),
-                        'ip_address': self.current_ip
+                        'ip_address': ip
                     }
 
-                    for i, trend in enumerate(trends[:5], 1):
-                        trend_data[f'trend{i}'] = trend
-
+                    stage = 'db'
                     self.db.insert_trends(trend_data)
                     self.logger.info("Successfully stored trends in MongoDB")
 
-                    return trends[:5]
+                    return trend_data
 
                 else:
                     raise Exception("No trends found in the 'What's happening' section")
 
             except Exception as e:
-                self.logger.error(f"Error during scraping (attempt {attempt + 1}): {str(e)}")
+                cause = self.failure_cause(stage, e)
+                self.logger.error("Error during scraping (attempt %s, %s): %s", attempt + 1, cause, e)
                 if attempt < max_retries - 1:
                     self.logger.info("Retrying...")
                     self.human_like_delay(5, 8)
                 else:
                     self.logger.error("Max retries reached")
-                    raise
+                    raise ScrapeError(cause, str(e)) from e
 
             finally:
                 if driver:
                     try:
                         driver.quit()
                     except Exception as e:
-                        self.logger.error(f"Error closing driver: {str(e)}")
+                        self.logger.error("Error closing driver: %s", e)
+                    browser_governor.release(driver)
 
-        return []
+        return None
 
 
 if __name__ == '__main__':
     try:
         scraper = TwitterScraper()
-        trends = scraper.get_trends()
-        print("Retrieved and stored trends:", trends)
+        snapshot = scraper.get_trends()
+        print("Retrieved and stored trends:", snapshot['trends'] if snapshot else [])
 
         latest_trends = scraper.db.get_latest_trends(limit=1)
         print("Latest trends from database:", latest_trends[0] if latest_trends else "No trends found")